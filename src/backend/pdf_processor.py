@@ -5,12 +5,17 @@ import json
 import logging
 from pydantic import BaseModel
 from datetime import datetime
+import time
 import stripe
+from suggestion_scheduler import SuggestionScheduler, get_default_scheduler
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on how long a request waits for model-backed field suggestions
+SUGGESTION_TIMEOUT_SECONDS = 5.0
+
 # Data models
 class PDFField(BaseModel):
     id: str
@@ -81,9 +86,12 @@ class PDFProcessor:
     and match to relevant workflows in the LA County marketplace.
     """
     
-    def __init__(self, stripe_api_key=None):
+    def __init__(self, stripe_api_key=None, suggestion_scheduler: Optional[SuggestionScheduler] = None):
         self.nlp_model = None  # Would initialize language model here
         self.stripe_api_key = stripe_api_key
+        # Field suggestions are batched across requests by a shared scheduler,
+        # resolved on first use so non-suggestion endpoints don't start it
+        self.suggestion_scheduler = suggestion_scheduler
         logger.info("LA County PDF Processor initialized")
     
     def extract_project_details(self, text: str) -> ProjectDetails:
@@ -178,45 +186,49 @@ class PDFProcessor:
     
     def generate_field_suggestions(self, document: PDFDocument, project_details: ProjectDetails) -> PDFDocument:
         """Generate AI suggestions for form fields based on project details"""
-        logger.info(f"Generating field suggestions for LA County document: {document.name}")
+        return self.generate_document_suggestions([document], project_details)[0]
+    
+    def generate_document_suggestions(self, documents: List[PDFDocument],
+                                      project_details: ProjectDetails) -> List[PDFDocument]:
+        """
+        Generate AI suggestions for the form fields of several documents, submitting
+        every field before waiting so they can share model batches
+        """
+        logger.info(f"Generating field suggestions for {len(documents)} LA County document(s)")
+        
+        if self.suggestion_scheduler is None:
+            self.suggestion_scheduler = get_default_scheduler()
         
-        # In production, this would use an LLM to generate contextual suggestions
-        # For this example, we'll use simple rules with LA County specific details
+        # Suggestions come from the scheduler's model backend (rule-based stub by default),
+        # which batches jobs from concurrent requests into single model calls
+        context = {
+            "project_type": project_details.project_type,
+            "description": project_details.description,
+            "location": project_details.location,
+            "start_date": datetime.now().strftime("%m/%d/%Y"),
+        }
         
-        # Simple date suggestions
-        today = datetime.now()
-        start_date = today.strftime("%m/%d/%Y")
+        pending = []
+        for document in documents:
+            for field in document.formFields:
+                try:
+                    pending.append((field, self.suggestion_scheduler.submit(field.label, context)))
+                except Exception as e:
+                    logger.error(f"Could not request suggestion for field '{field.label}': {str(e)}")
         
-        for field in document.formFields:
-            if "description" in field.label.lower():
-                field.suggestion = f"{project_details.project_type.title()} - {project_details.description[:20]}"
-            elif "address" in field.label.lower() or "location" in field.label.lower():
-                field.suggestion = f"123 Main St, {project_details.location}"
-            elif "date" in field.label.lower():
-                field.suggestion = start_date
-            elif "duration" in field.label.lower() or "days" in field.label.lower():
-                field.suggestion = "14"  # Two weeks
-            elif "length" in field.label.lower() and "trench" in field.label.lower():
-                field.suggestion = "500"  # 500 feet
-            elif "width" in field.label.lower() and "trench" in field.label.lower():
-                field.suggestion = "24"  # 24 inches
-            elif "license" in field.label.lower() or "contractor" in field.label.lower():
-                field.suggestion = "LA-123456"
-            elif "street" in field.label.lower() and "classification" in field.label.lower():
-                field.suggestion = "Collector Street"
-            elif "lane" in field.label.lower() and "closure" in field.label.lower():
-                field.suggestion = "Partial - One Lane"
-            elif "hours" in field.label.lower():
-                field.suggestion = "9:00 AM - 4:00 PM"
-            elif "pedestrian" in field.label.lower():
-                field.suggestion = "Temporary Walkway"
-            # LA County specific
-            elif "la" in field.label.lower() or "los angeles" in field.label.lower():
-                field.suggestion = "Los Angeles County"
-            elif "agency" in field.label.lower():
-                field.suggestion = "LA County Public Works"
+        # Fall back to no suggestion rather than holding the request open
+        deadline = time.monotonic() + SUGGESTION_TIMEOUT_SECONDS
+        for field, future in pending:
+            try:
+                suggestion = future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception as e:
+                logger.error(f"Suggestion failed for field '{field.label}': {type(e).__name__} {str(e)}")
+                future.cancel()
+                continue
+            if suggestion is not None:
+                field.suggestion = suggestion
         
-        return document
+        return documents
     
     def process_payment(self, workflow_id: str, token: str, customer_email: str) -> Dict[str, Any]:
         """Process payment for a workflow purchase"""
@@ -317,9 +329,8 @@ def process_pdf_document(pdf_path: str, project_description: str = "") -> dict:
     # Process PDF
     documents = processor.analyze_pdf(pdf_path)
     
-    # Generate suggestions for each document
-    for i in range(len(documents)):
-        documents[i] = processor.generate_field_suggestions(documents[i], project_details)
+    # Generate suggestions for all documents together
+    documents = processor.generate_document_suggestions(documents, project_details)
     
     # Find matching workflows
     workflows = processor.match_workflows(project_description, project_details.location)
@@ -0,0 +1,304 @@
+import math
+import threading
+import time
+import logging
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Tuple
+import queue
+
+# Initialize logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SuggestionJob:
+    """
+    A single pending field-suggestion request: the field label plus the
+    project context the suggestion depends on
+    """
+
+    def __init__(self, label: str, context: Dict[str, str], key: Tuple):
+        self.label = label
+        self.context = context
+        self.key = key
+
+class SuggestionBackend(ABC):
+    """
+    Interface for model backends. A backend receives a whole batch of jobs
+    and returns one suggestion (or None) per job, in the same order.
+    """
+
+    @abstractmethod
+    def suggest_batch(self, jobs: List[SuggestionJob]) -> List[Optional[str]]:
+        pass
+
+    def context_fields(self, label: str) -> Optional[Tuple[str, ...]]:
+        """
+        Context fields the suggestion for this label depends on, used to key
+        the result cache. None means the suggestion may depend on all of them.
+        """
+        return None
+
+    def normalize_label(self, label: str) -> str:
+        """
+        Canonical form of a label for caching and dedupe. Labels are kept as
+        given unless the backend treats variants as the same field.
+        """
+        return label
+
+class RuleBasedSuggestionBackend(SuggestionBackend):
+    """
+    Local deterministic backend using simple LA County rules.
+    Stands in for an LLM in development and testing.
+    """
+
+    # Context each rule reads; rules not listed depend on the label alone
+    RULE_CONTEXT = {
+        "description": ("project_type", "description"),
+        "address": ("location",),
+        "date": ("start_date",),
+    }
+
+    def suggest_batch(self, jobs: List[SuggestionJob]) -> List[Optional[str]]:
+        return [self._suggest(job.label, job.context) for job in jobs]
+
+    def context_fields(self, label: str) -> Optional[Tuple[str, ...]]:
+        return self.RULE_CONTEXT.get(self._match_rule(label), ())
+
+    def normalize_label(self, label: str) -> str:
+        # Rules match case-insensitively
+        return label.lower()
+
+    def _match_rule(self, label: str) -> Optional[str]:
+        label = label.lower()
+
+        if "description" in label:
+            return "description"
+        elif "address" in label or "location" in label:
+            return "address"
+        elif "date" in label:
+            return "date"
+        elif "duration" in label or "days" in label:
+            return "duration"
+        elif "length" in label and "trench" in label:
+            return "trench_length"
+        elif "width" in label and "trench" in label:
+            return "trench_width"
+        elif "license" in label or "contractor" in label:
+            return "license"
+        elif "street" in label and "classification" in label:
+            return "street_classification"
+        elif "lane" in label and "closure" in label:
+            return "lane_closure"
+        elif "hours" in label:
+            return "hours"
+        elif "pedestrian" in label:
+            return "pedestrian"
+        # LA County specific
+        elif "la" in label or "los angeles" in label:
+            return "la_county"
+        elif "agency" in label:
+            return "agency"
+        return None
+
+    def _suggest(self, label: str, context: Dict[str, str]) -> Optional[str]:
+        rule = self._match_rule(label)
+
+        if rule == "description":
+            return f"{context['project_type'].title()} - {context['description'][:20]}"
+        elif rule == "address":
+            return f"123 Main St, {context['location']}"
+        elif rule == "date":
+            return context["start_date"]
+        elif rule == "duration":
+            return "14"  # Two weeks
+        elif rule == "trench_length":
+            return "500"  # 500 feet
+        elif rule == "trench_width":
+            return "24"  # 24 inches
+        elif rule == "license":
+            return "LA-123456"
+        elif rule == "street_classification":
+            return "Collector Street"
+        elif rule == "lane_closure":
+            return "Partial - One Lane"
+        elif rule == "hours":
+            return "9:00 AM - 4:00 PM"
+        elif rule == "pedestrian":
+            return "Temporary Walkway"
+        elif rule == "la_county":
+            return "Los Angeles County"
+        elif rule == "agency":
+            return "LA County Public Works"
+        return None
+
+class SuggestionScheduler:
+    """
+    Collects field-suggestion jobs from concurrent requests into batches,
+    bounded by max_batch_size and max_wait_ms, runs each batch through the
+    model backend, and routes results back to the waiting callers.
+    Results are memoized per label (plus the context the backend says the
+    label depends on) in an LRU cache.
+    """
+
+    def __init__(self, backend: Optional[SuggestionBackend] = None, max_batch_size: int = 32,
+                 max_wait_ms: float = 10.0, cache_size: int = 1024):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if not math.isfinite(max_wait_ms) or max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be a finite, non-negative number")
+        if cache_size < 0:
+            raise ValueError("cache_size must not be negative")
+        self.backend = backend or RuleBasedSuggestionBackend()
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.cache_size = cache_size
+
+        self._queue: "queue.Queue[Optional[SuggestionJob]]" = queue.Queue()
+        self._cache: "OrderedDict[Tuple, Optional[str]]" = OrderedDict()
+        # Every caller gets its own future; identical in-flight jobs share one queue entry
+        self._pending: Dict[Tuple, List[Future]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="suggestion-scheduler", daemon=True)
+        self._worker.start()
+        logger.info(f"Suggestion scheduler started (batch size {max_batch_size}, wait {max_wait_ms}ms)")
+
+    def submit(self, label: str, context: Dict[str, str]) -> Future:
+        """Queue a suggestion job and return a future for its result"""
+        key = self._cache_key(label, context)
+        future = Future()
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Suggestion scheduler is closed")
+
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                future.set_result(self._cache[key])
+                return future
+
+            if key in self._pending:
+                self._pending[key].append(future)
+                return future
+
+            self._pending[key] = [future]
+            self._queue.put(SuggestionJob(label, context, key))
+
+        return future
+
+    def suggest(self, label: str, context: Dict[str, str], timeout: float = None) -> Optional[str]:
+        """Blocking convenience wrapper around submit()"""
+        return self.submit(label, context).result(timeout=timeout)
+
+    def close(self):
+        """Stop the worker after processing jobs already queued"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._worker.join()
+
+        # Anything still pending was lost with a failed worker; don't leave callers hanging
+        with self._lock:
+            leftover = [f for futures in self._pending.values() for f in futures]
+            self._pending.clear()
+        for future in leftover:
+            self._resolve(future, error=RuntimeError("Suggestion scheduler is closed"))
+
+    def _cache_key(self, label: str, context: Dict[str, str]) -> Tuple:
+        fields = self.backend.context_fields(label)
+        if fields is None:
+            fields = sorted(context)
+        return (self.backend.normalize_label(label), tuple((name, context.get(name)) for name in fields))
+
+    def _collect_batch(self) -> Tuple[List[SuggestionJob], bool]:
+        job = self._queue.get()
+        if job is None:
+            return [], True
+
+        batch = [job]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            # Always take jobs already queued; only wait for more while time remains
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if job is None:
+                return batch, True
+            batch.append(job)
+
+        return batch, False
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch, stopping = self._collect_batch()
+            if not batch:
+                continue
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                logger.error(f"Unexpected error in suggestion scheduler: {str(e)}")
+                self._fail_batch(batch, e)
+
+    def _process_batch(self, batch: List[SuggestionJob]):
+        try:
+            results = self.backend.suggest_batch(batch)
+            if len(results) != len(batch):
+                raise ValueError(f"Backend returned {len(results)} results for {len(batch)} jobs")
+        except Exception as e:
+            logger.error(f"Suggestion batch failed: {str(e)}")
+            self._fail_batch(batch, e)
+            return
+
+        with self._lock:
+            waiting = [self._pending.pop(job.key, []) for job in batch]
+            if self.cache_size > 0:
+                for job, result in zip(batch, results):
+                    self._cache[job.key] = result
+                    self._cache.move_to_end(job.key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        for futures, result in zip(waiting, results):
+            for future in futures:
+                self._resolve(future, result=result)
+
+    def _fail_batch(self, batch: List[SuggestionJob], error: Exception):
+        with self._lock:
+            waiting = [self._pending.pop(job.key, []) for job in batch]
+        for futures in waiting:
+            for future in futures:
+                self._resolve(future, error=error)
+
+    @staticmethod
+    def _resolve(future: Future, result: Optional[str] = None, error: Exception = None):
+        # Callers may have cancelled their future; skip those instead of raising
+        if not future.set_running_or_notify_cancel():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+# Shared scheduler so jobs from concurrent requests land in the same batches
+_default_scheduler: Optional[SuggestionScheduler] = None
+_default_scheduler_lock = threading.Lock()
+
+def get_default_scheduler() -> SuggestionScheduler:
+    """Return the process-wide suggestion scheduler, creating it on first use"""
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = SuggestionScheduler()
+        return _default_scheduler
@@ -0,0 +1,247 @@
+import threading
+import time
+from datetime import datetime
+from typing import List, Optional
+
+import pytest
+
+from suggestion_scheduler import (
+    RuleBasedSuggestionBackend,
+    SuggestionBackend,
+    SuggestionJob,
+    SuggestionScheduler,
+)
+
+CONTEXT = {
+    "project_type": "utility",
+    "description": "Fiber install",
+    "location": "Los Angeles County",
+    "start_date": "01/02/2026",
+}
+
+class RecordingBackend(RuleBasedSuggestionBackend):
+    """Rule-based backend that records batch sizes and can be held open"""
+
+    def __init__(self):
+        self.batches: List[List[str]] = []
+        self.release = threading.Event()
+        self.release.set()
+        self.entered = threading.Event()
+
+    def suggest_batch(self, jobs: List[SuggestionJob]) -> List[Optional[str]]:
+        self.entered.set()
+        self.release.wait()
+        self.batches.append([job.label for job in jobs])
+        return super().suggest_batch(jobs)
+
+class FailingBackend(SuggestionBackend):
+    def suggest_batch(self, jobs: List[SuggestionJob]) -> List[Optional[str]]:
+        raise RuntimeError("model unavailable")
+
+@pytest.fixture
+def backend():
+    return RecordingBackend()
+
+def test_batches_bounded_by_size(backend):
+    scheduler = SuggestionScheduler(backend, max_batch_size=2, max_wait_ms=500, cache_size=0)
+    futures = [scheduler.submit(f"Field {i} Hours", CONTEXT) for i in range(5)]
+    for future in futures:
+        assert future.result(timeout=5) == "9:00 AM - 4:00 PM"
+    scheduler.close()
+    assert [len(batch) for batch in backend.batches] == [2, 2, 1]
+
+def test_batch_closes_after_max_wait(backend):
+    scheduler = SuggestionScheduler(backend, max_batch_size=100, max_wait_ms=20)
+    start = time.monotonic()
+    assert scheduler.suggest("Working Hours", CONTEXT, timeout=5) == "9:00 AM - 4:00 PM"
+    assert time.monotonic() - start < 2
+    scheduler.close()
+    assert backend.batches == [["Working Hours"]]
+
+def test_zero_wait_still_takes_already_queued_jobs(backend):
+    backend.release.clear()
+    scheduler = SuggestionScheduler(backend, max_batch_size=100, max_wait_ms=0)
+    first = scheduler.submit("Working Hours", CONTEXT)
+    assert backend.entered.wait(timeout=5)
+    # These queue up while the worker is busy with the first batch
+    labels = [f"Field {i} Hours" for i in range(10)]
+    futures = [scheduler.submit(label, CONTEXT) for label in labels]
+    backend.release.set()
+
+    assert first.result(timeout=5) == "9:00 AM - 4:00 PM"
+    assert all(f.result(timeout=5) == "9:00 AM - 4:00 PM" for f in futures)
+    scheduler.close()
+    assert backend.batches == [["Working Hours"], labels]
+
+def test_concurrent_callers_share_batches_and_get_their_own_results(backend):
+    scheduler = SuggestionScheduler(backend, max_batch_size=100, max_wait_ms=100)
+    results = {}
+
+    def request(i):
+        context = dict(CONTEXT, location=f"Site {i}")
+        results[i] = scheduler.suggest("LA County Location", context, timeout=5)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    scheduler.close()
+
+    assert results == {i: f"123 Main St, Site {i}" for i in range(6)}
+    assert sum(len(batch) for batch in backend.batches) == 6
+    assert len(backend.batches) < 6
+
+def test_labels_keyed_as_given_unless_backend_normalizes(backend):
+    class EchoBackend(SuggestionBackend):
+        def suggest_batch(self, jobs: List[SuggestionJob]) -> List[Optional[str]]:
+            return [job.label for job in jobs]
+
+    scheduler = SuggestionScheduler(EchoBackend(), max_wait_ms=0)
+    assert scheduler.suggest("Start Date", CONTEXT, timeout=5) == "Start Date"
+    assert scheduler.suggest("START DATE", CONTEXT, timeout=5) == "START DATE"
+    scheduler.close()
+
+    # The rule-based backend matches case-insensitively, so variants share a result
+    scheduler = SuggestionScheduler(backend, max_wait_ms=0)
+    scheduler.suggest("Start Date", CONTEXT, timeout=5)
+    scheduler.suggest("START DATE", CONTEXT, timeout=5)
+    scheduler.close()
+    assert backend.batches == [["Start Date"]]
+
+def test_cache_keyed_on_label_and_used_context_only(backend):
+    scheduler = SuggestionScheduler(backend, max_wait_ms=0)
+    assert scheduler.suggest("Duration (days)", CONTEXT, timeout=5) == "14"
+    # A different project reuses the label-only result
+    other = dict(CONTEXT, description="Something else", start_date="02/03/2026")
+    assert scheduler.suggest("Duration (days)", other, timeout=5) == "14"
+    assert scheduler.suggest("Start Date", CONTEXT, timeout=5) == "01/02/2026"
+    assert scheduler.suggest("Start Date", other, timeout=5) == "02/03/2026"
+    scheduler.close()
+    assert backend.batches == [["Duration (days)"], ["Start Date"], ["Start Date"]]
+
+def test_lru_eviction(backend):
+    scheduler = SuggestionScheduler(backend, max_wait_ms=0, cache_size=2)
+    for label in ["Working Hours", "Duration (days)", "Working Hours", "Agency Name", "Duration (days)"]:
+        scheduler.suggest(label, CONTEXT, timeout=5)
+    scheduler.close()
+    # "Duration" was least recently used when "Agency" was added, so it is recomputed
+    assert backend.batches == [["Working Hours"], ["Duration (days)"], ["Agency Name"], ["Duration (days)"]]
+
+def test_backend_failure_propagates_to_futures():
+    scheduler = SuggestionScheduler(FailingBackend(), max_wait_ms=0)
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        scheduler.suggest("Working Hours", CONTEXT, timeout=5)
+    # The worker survives a failed batch
+    with pytest.raises(RuntimeError, match="model unavailable"):
+        scheduler.suggest("Working Hours", CONTEXT, timeout=5)
+    scheduler.close()
+
+def test_incomplete_backend_fails_at_construction():
+    class Incomplete(SuggestionBackend):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_invalid_configuration_rejected(backend):
+    with pytest.raises(ValueError):
+        SuggestionScheduler(backend, max_batch_size=0)
+    with pytest.raises(ValueError):
+        SuggestionScheduler(backend, max_wait_ms=-1)
+    with pytest.raises(ValueError):
+        SuggestionScheduler(backend, max_wait_ms=float("nan"))
+    with pytest.raises(ValueError):
+        SuggestionScheduler(backend, cache_size=-1)
+
+def test_cancel_affects_only_that_caller(backend):
+    backend.release.clear()
+    scheduler = SuggestionScheduler(backend, max_wait_ms=0)
+    first = scheduler.submit("Working Hours", CONTEXT)
+    second = scheduler.submit("Working Hours", CONTEXT)
+    assert first.cancel()
+    backend.release.set()
+
+    assert second.result(timeout=5) == "9:00 AM - 4:00 PM"
+    assert first.cancelled()
+    # The worker is still alive for later jobs
+    assert scheduler.suggest("Agency Name", CONTEXT, timeout=5) == "LA County Public Works"
+    scheduler.close()
+
+def test_close_processes_queued_jobs_then_rejects_new_ones(backend):
+    backend.release.clear()
+    scheduler = SuggestionScheduler(backend, max_batch_size=1, max_wait_ms=0)
+    futures = [scheduler.submit(label, CONTEXT) for label in ["Working Hours", "Agency Name"]]
+    closer = threading.Thread(target=scheduler.close)
+    closer.start()
+    backend.release.set()
+    closer.join(timeout=5)
+
+    assert [f.result(timeout=0) for f in futures] == ["9:00 AM - 4:00 PM", "LA County Public Works"]
+    with pytest.raises(RuntimeError):
+        scheduler.submit("Working Hours", CONTEXT)
+
+def test_generate_field_suggestions_matches_rule_output(backend):
+    pytest.importorskip("pydantic")
+    pytest.importorskip("stripe")
+    from pdf_processor import PDFProcessor
+
+    scheduler = SuggestionScheduler(backend, max_wait_ms=200)
+    processor = PDFProcessor(suggestion_scheduler=scheduler)
+    details = processor.extract_project_details(
+        "Need to install fiber optic cable in Los Angeles, 500ft trench along Main Street"
+    )
+    documents = processor.generate_document_suggestions(
+        [
+            processor._create_la_trenching_permit(),
+            processor._create_la_traffic_control_plan(),
+            processor._create_la_utility_notification(),
+        ],
+        details,
+    )
+    scheduler.close()
+
+    today = datetime.now().strftime("%m/%d/%Y")
+    assert [[f.suggestion for f in doc.formFields] for doc in documents] == [
+        ["Utility - Need to install fibe", "123 Main St, Los Angeles County", today,
+         "14", "500", "24", "LA-123456"],
+        ["Collector Street", "Partial - One Lane", "9:00 AM - 4:00 PM", None, "Temporary Walkway"],
+        [None, None, None, None, today],
+    ]
+    # All 17 fields across the three documents are submitted before waiting
+    assert backend.batches == [[f.label for doc in documents for f in doc.formFields]]
+
+def test_generate_field_suggestions_falls_back_on_failure():
+    pytest.importorskip("pydantic")
+    pytest.importorskip("stripe")
+    from pdf_processor import PDFProcessor
+
+    scheduler = SuggestionScheduler(FailingBackend(), max_wait_ms=0)
+    processor = PDFProcessor(suggestion_scheduler=scheduler)
+    details = processor.extract_project_details("trench in Los Angeles")
+    document = processor.generate_field_suggestions(processor._create_la_trenching_permit(), details)
+    scheduler.close()
+
+    assert all(field.suggestion is None for field in document.formFields)
+
+def test_generate_field_suggestions_falls_back_on_timeout(backend, monkeypatch):
+    pytest.importorskip("pydantic")
+    pytest.importorskip("stripe")
+    import pdf_processor
+    from pdf_processor import PDFProcessor
+
+    monkeypatch.setattr(pdf_processor, "SUGGESTION_TIMEOUT_SECONDS", 0.1)
+    backend.release.clear()
+    scheduler = SuggestionScheduler(backend, max_wait_ms=0)
+    processor = PDFProcessor(suggestion_scheduler=scheduler)
+    details = processor.extract_project_details("trench in Los Angeles")
+
+    start = time.monotonic()
+    document = processor.generate_field_suggestions(processor._create_la_trenching_permit(), details)
+    assert time.monotonic() - start < 2
+    assert all(field.suggestion is None for field in document.formFields)
+
+    # Releasing the held batch skips the cancelled futures and keeps the worker serving
+    backend.release.set()
+    assert scheduler.suggest("Working Hours", CONTEXT, timeout=5) == "9:00 AM - 4:00 PM"
+    scheduler.close()